@@ -2,6 +2,7 @@ import functools
 import json
 import os
 import re
+import resource
 import sys
 from collections import OrderedDict
 from datetime import datetime
@@ -155,10 +156,78 @@ def load_json(*json_path_segments):
         return json.loads(json_file.read())
 
 
+json_encoder = json.JSONEncoder(indent=2, sort_keys=True)
+
+
 def persist_json_file(data_dict, *json_path_segments):
+    """
+    Write data_dict as pretty-printed JSON, streaming it to disk chunk by chunk.
+
+    The output is byte-identical to json.dumps(data_dict, indent=2, sort_keys=True), but the whole document is never
+    built up as a single string.
+    """
+    json_path = os.path.join(project_root, *json_path_segments)
+    with open(json_path, mode="w") as json_file:
+        for chunk in json_encoder.iterencode(data_dict):
+            json_file.write(chunk)
+
+
+def persist_json_object_stream(sorted_items, *json_path_segments):
+    """
+    Write a JSON object from an iterable of (key, value) pairs which are already sorted by key.
+
+    Only one value is held in memory at a time. The output is byte-identical to persist_json_file() called with the
+    equivalent dict.
+    """
     json_path = os.path.join(project_root, *json_path_segments)
     with open(json_path, mode="w") as json_file:
-        json_file.write(json.dumps(data_dict, indent=2, sort_keys=True))
+        is_empty = True
+        for key, value in sorted_items:
+            json_file.write("{\n  " if is_empty else ",\n  ")
+            is_empty = False
+            json_file.write(json.dumps(key))
+            json_file.write(": ")
+            for chunk in json_encoder.iterencode(value):
+                # Newlines only ever appear between tokens, since they are escaped inside JSON strings.
+                json_file.write(chunk.replace("\n", "\n  "))
+        json_file.write("{}" if is_empty else "\n}")
+
+
+def append_ndjson_line(data, *ndjson_path_segments):
+    ndjson_path = os.path.join(project_root, *ndjson_path_segments)
+    with open(ndjson_path, mode="a") as ndjson_file:
+        ndjson_file.write(json.dumps(data, sort_keys=True) + "\n")
+
+
+def iter_ndjson_lines(*ndjson_path_segments):
+    """
+    Yield (byte_offset, data) for each line of an NDJSON file, so that lines can be re-read later with
+    read_ndjson_line().
+    """
+    ndjson_path = os.path.join(project_root, *ndjson_path_segments)
+    with open(ndjson_path, mode="rb") as ndjson_file:
+        while True:
+            offset = ndjson_file.tell()
+            line = ndjson_file.readline()
+            if not line:
+                return
+            yield offset, json.loads(line)
+
+
+def read_ndjson_line(ndjson_file, offset):
+    ndjson_file.seek(offset)
+    return json.loads(ndjson_file.readline())
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process in megabytes.
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # macOS reports bytes, Linux reports kilobytes
+        return max_rss / (1024 * 1024)
+    return max_rss / 1024
 
 
 grey_list = set()
@@ -459,9 +528,46 @@ def choose_matching_model_for_style(model_style_name, model_choices):
     return None
 
 
+ORPHANED_STYLES_SIDECAR = "all_orphaned_styles.ndjson"
+
+
+def merge_orphaned_styles():
+    """
+    Merge the orphaned styles sidecar into all_orphaned_styles.json, sorted by make name.
+
+    Only the make names and their line offsets are held in memory; each make's orphans are re-read from the sidecar
+    as they are written.
+    """
+    print("ALL MODELS WE COULD NOT FIND:")
+    offsets_by_make_name = {}
+    for offset, make_orphans in iter_ndjson_lines("data", ORPHANED_STYLES_SIDECAR):
+        offsets_by_make_name[make_orphans["make_name"]] = offset
+        print(f"For make {make_orphans['make_name']}")
+        print(f"Model choices: {make_orphans['model_choices']}")
+        for orphaned_style in make_orphans["orphaned_styles"]:
+            print(orphaned_style)
+
+    sidecar_path = path_to_file("data", ORPHANED_STYLES_SIDECAR)
+    with open(sidecar_path, mode="rb") as sidecar_file:
+        def sorted_orphans():
+            for make_name in sorted(offsets_by_make_name):
+                make_orphans = read_ndjson_line(sidecar_file, offsets_by_make_name[make_name])
+                del make_orphans["make_name"]
+                yield make_name, make_orphans
+
+        persist_json_object_stream(sorted_orphans(), "data", "all_orphaned_styles.json")
+    os.remove(sidecar_path)
+
+
 def update_styles(target_make=None):
+    """
+    Update the styles file for each make, writing each one as soon as that make finishes.
+
+    Styles are kept out of the loaded makes so that memory use stays flat in the number of makes. Orphaned styles are
+    appended to an NDJSON sidecar and merged into all_orphaned_styles.json at the end.
+    """
     all_makes = load_make_models_json()
-    all_orphaned_styles = {}
+    open(path_to_file("data", ORPHANED_STYLES_SIDECAR), mode="w").close()
 
     for make in tqdm(all_makes):
         if target_make and make["make_slug"] != target_make:
@@ -470,10 +576,8 @@ def update_styles(target_make=None):
             print(f"BAD MAKE missing first_year or last_year: {make}")
             continue
         model_choices = make["models"].keys()
-        all_orphaned_styles[make["make_name"]] = {
-            "model_choices": list(model_choices),
-            "orphaned_styles": [],
-        }
+        styles_by_model = {model_name: OrderedDict() for model_name in model_choices}
+        orphaned_styles = []
         for year in range(make["first_year"], make["last_year"] + 1):
             details = fetch_vehicle_details(year=year, make=make["make_name"])
             for detail in details:
@@ -482,7 +586,7 @@ def update_styles(target_make=None):
 
                 matching_model = choose_matching_model_for_style(model_style_name, model_choices)
                 if matching_model:
-                    model_styles = make["models"][matching_model]["model_styles"]
+                    model_styles = styles_by_model[matching_model]
                     if model_style_name not in model_styles:
                         model_styles[model_style_name] = {
                             "years": [year],
@@ -491,25 +595,22 @@ def update_styles(target_make=None):
                     else:
                         model_styles[model_style_name]["years"].append(year)
                 else:
-                    all_orphaned_styles[make["make_name"]]["orphaned_styles"].append(model_style_name)
+                    orphaned_styles.append(model_style_name)
                     print(make["make_name"] + " could not find model style: " + model_style_name)
 
-        print(f"Found orphans for make {make['make_name']}: \n {all_orphaned_styles[make['make_name']]}")
-
-        style_data = OrderedDict()
-        for model_key in sorted(make["models"]):
-            style_data[model_key] = OrderedDict(make["models"][model_key]["model_styles"])
-        persist_json_file(style_data, "data", "styles", make["make_slug"] + ".json")
+        make_orphans = {
+            "make_name": make["make_name"],
+            "model_choices": list(model_choices),
+            "orphaned_styles": orphaned_styles,
+        }
+        print(f"Found orphans for make {make['make_name']}: \n {make_orphans}")
+        append_ndjson_line(make_orphans, "data", ORPHANED_STYLES_SIDECAR)
 
-    print("ALL MODELS WE COULD NOT FIND:")
-    for make, values in all_orphaned_styles.items():
-        print(f"For make {make}")
-        print(f"Model choices: {values['model_choices']}")
-        for orphaned_style in values["orphaned_styles"]:
-            print(orphaned_style)
+        persist_json_file(styles_by_model, "data", "styles", make["make_slug"] + ".json")
+        print(f"Peak RSS after make {make['make_name']}: {peak_rss_mb():.1f} MB")
 
-    print(all_orphaned_styles)
-    persist_json_file(all_orphaned_styles, "data", "all_orphaned_styles.json")
+    merge_orphaned_styles()
+    print(f"Peak RSS after updating styles: {peak_rss_mb():.1f} MB")
 
 
 def update_readme():